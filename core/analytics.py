@@ -0,0 +1,128 @@
+"""
+Task analytics computed in the database: each report is one GROUP BY query,
+with overall totals folded from the grouped rows in Python. Per-category rows
+are rolled up over each category's subtree with a recursive CTE.
+"""
+from datetime import timedelta
+
+from django.db import connections
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Category, Task
+
+BUCKETS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+GROUPS = {
+    "product": ("product_id", "product__name"),
+    "category": ("product__category_id", "product__category__name"),
+}
+
+
+def _aggregates():
+    completed = Q(status=Task.STATUS_COMPLETED)
+    timed = completed & Q(completed_at__isnull=False)
+    return {
+        "total": Count("id"),
+        "completed": Count("id", filter=completed),
+        "overdue": Count("id", filter=Q(due_date__lt=timezone.now()) & ~completed),
+        "timed": Count("id", filter=timed),
+        "completion_time": Sum(ExpressionWrapper(F("completed_at") - F("created_at"), output_field=DurationField()),
+                               filter=timed),
+    }
+
+
+def _finish(row):
+    total, completed, timed = row.pop("total"), row.pop("completed"), row.pop("timed")
+    completion_time = row.pop("completion_time")
+    row.update({
+        "total": total,
+        "completed": completed,
+        "overdue": row.pop("overdue"),
+        "completion_rate": round(completed / total, 4) if total else None,
+        "avg_completion_seconds": round(completion_time.total_seconds() / timed, 1) if timed else None,
+    })
+    return row
+
+
+def _sum(rows, into=None):
+    into = into if into is not None else {}
+    for key in ("total", "completed", "overdue", "timed"):
+        into[key] = into.get(key, 0) + sum(row[key] for row in rows)
+    into["completion_time"] = sum((row["completion_time"] for row in rows if row["completion_time"]),
+                                  into.get("completion_time") or timedelta())
+    return into
+
+
+def _totals(rows):
+    return _finish(_sum(rows))
+
+
+def _ancestors(using, category_ids):
+    """(ancestor, descendant) pairs: each category with itself and every category above it."""
+    if not category_ids:
+        return []
+    table = Category._meta.db_table
+    placeholders = ", ".join(["%s"] * len(category_ids))
+    with connections[using].cursor() as cursor:
+        # UNION (not UNION ALL) stops on parent cycles, as in Category.subtree()
+        cursor.execute(
+            'WITH RECURSIVE up(ancestor, descendant) AS ('
+            f'SELECT id, id FROM "{table}" WHERE id IN ({placeholders}) '
+            f'UNION SELECT c.parent_id, up.descendant FROM up JOIN "{table}" c ON c.id = up.ancestor '
+            'WHERE c.parent_id IS NOT NULL'
+            ') SELECT ancestor, descendant FROM up',
+            list(category_ids),
+        )
+        return cursor.fetchall()
+
+
+def _roll_up(rows, using, within=None):
+    """Per-category rows covering each category's whole subtree, limited to `within`'s subtree if given."""
+    id_field, name_field = GROUPS["category"]
+    direct = {row[id_field]: row for row in rows}
+    pairs = _ancestors(using, list(direct))
+    if within is not None:
+        inside = set(Category.objects.using(using).filter(id__in=within.subtree()).values_list("id", flat=True))
+        pairs = [(ancestor, descendant) for ancestor, descendant in pairs if ancestor in inside]
+    names = dict(Category.objects.using(using).filter(id__in={a for a, _ in pairs}).values_list("id", "name"))
+    rolled = {}
+    for ancestor, descendant in pairs:
+        row = rolled.setdefault(ancestor, {id_field: ancestor, name_field: names[ancestor]})
+        _sum([direct[descendant]], into=row)
+    return [rolled[pk] for pk in sorted(rolled)]
+
+
+def task_series(queryset, bucket):
+    """Counts, completion rate and average completion time per created_at bucket."""
+    rows = list(
+        queryset.annotate(bucket=BUCKETS[bucket]("created_at"))
+        .values("bucket")
+        .annotate(**_aggregates())
+        .order_by("bucket")
+    )
+    totals = _totals(rows)
+    return {"bucket": bucket, "totals": totals, "series": [_finish(row) for row in rows]}
+
+
+def task_breakdown(queryset, group, within=None):
+    """
+    The same figures per product or per category. A category's row covers its whole
+    subtree (a parent includes its subcategories' tasks); pass the filtered category
+    as `within` to list only the categories inside it.
+    """
+    id_field, name_field = GROUPS[group]
+    rows = list(
+        queryset.values(id_field, name_field)
+        .annotate(**_aggregates())
+        .order_by(id_field)
+    )
+    totals = _totals(rows)
+    if group == "category":
+        rows = _roll_up(rows, queryset.db, within)
+    results = []
+    for row in rows:
+        item = {"id": row.pop(id_field), "name": row.pop(name_field)}
+        item.update(_finish(row))
+        results.append(item)
+    return {"group": group, "totals": totals, "results": results}
@@ -0,0 +1,65 @@
+"""
+Background jobs for admin operations that are too big for one request.
+
+A job is a bound Celery task that hands its work to `run_chunked`: every chunk is
+committed in its own transaction (short locks), progress is published through the
+result backend (django_celery_results) and a cancel flag in the cache is checked
+between chunks. Jobs are polled/cancelled through /api/jobs/<id>/.
+"""
+from celery.exceptions import Ignore
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+STATE_PROGRESS = "PROGRESS"
+STATE_CANCELLED = "CANCELLED"
+
+CANCEL_KEY = "job:cancel:{}"
+CANCEL_TTL = 60 * 60 * 24
+
+
+def chunked(ids, size=None):
+    size = size or settings.JOB_CHUNK_SIZE
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def run_chunked(task, chunks, total, process):
+    """
+    Call `process(chunk)` for each chunk inside its own transaction. `process` returns
+    the number of rows it handled. Returns {"done", "total"}; if the job is cancelled
+    it stops after the current chunk and ends in the CANCELLED state.
+    """
+    job_id = task.request.id
+    done = 0
+    for chunk in chunks:
+        if is_cancelled(job_id):
+            task.update_state(state=STATE_CANCELLED, meta={"done": done, "total": total})
+            raise Ignore()
+        with transaction.atomic():
+            done += process(chunk)
+        task.update_state(state=STATE_PROGRESS, meta={"done": done, "total": total})
+    return {"done": done, "total": total}
+
+
+def is_cancelled(job_id):
+    return cache.get(CANCEL_KEY.format(job_id)) is not None
+
+
+def cancel_job(job_id):
+    from taskprod.celery import app
+
+    cache.set(CANCEL_KEY.format(job_id), True, CANCEL_TTL)
+    # jobs still waiting in the queue are dropped by the workers before they start
+    app.control.revoke(job_id)
+
+
+def job_status(job_id):
+    from taskprod.celery import app
+
+    result = AsyncResult(job_id, app=app)
+    info = result.info
+    if isinstance(info, Exception):
+        info = {"error": str(info)}
+    return {"id": job_id, "state": result.state, **(info if isinstance(info, dict) else {})}
@@ -0,0 +1,225 @@
+"""
+Load-test harness: virtual users drive a mixed workload (JWT login, task CRUD,
+product search, reminder scheduling) against a running API over HTTP and every
+call is timed. `manage.py loadtest` runs it against an in-process server on a
+throwaway test database; the tests point it at pytest-django's live_server.
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.utils import timezone
+
+from .models import Category, Product
+from .tasks import schedule_reminders
+
+User = get_user_model()
+
+PASSWORD = "loadtest-pass"
+WORDS = ("alpha", "bravo", "cargo", "delta", "engine", "filter", "gasket", "harness", "intake", "joint")
+
+# operation -> relative weight in the traffic mix
+MIX = {
+    "login": 5,
+    "task_list": 20,
+    "task_create": 15,
+    "task_retrieve": 10,
+    "task_update": 10,
+    "task_delete": 5,
+    "product_search": 30,
+    "schedule_reminders": 5,
+}
+
+
+def seed(users, products=50, categories=5):
+    """Create `users` accounts plus a product catalogue; returns ([(username, user_id)], [product_id])."""
+    password = make_password(PASSWORD)  # hash once, not once per account
+    names = [f"loadtest{i}" for i in range(users)]
+    User.objects.bulk_create([User(username=name, email=f"{name}@example.com", password=password) for name in names])
+    accounts = list(User.objects.filter(username__in=names).order_by("id").values_list("username", "id"))
+
+    cats = Category.objects.bulk_create([Category(name=f"Category {i}") for i in range(categories)])
+    Product.objects.bulk_create([
+        Product(category=cats[i % categories], name=f"{WORDS[i % len(WORDS)]} {i}", price=i + 1, stock=100,
+                description=f"{WORDS[(i * 7) % len(WORDS)]} part")
+        for i in range(products)
+    ])
+    return accounts, list(Product.objects.values_list("id", flat=True))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def summarize(latencies, errors):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None  # noqa: E731
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / count) if count else None,
+            **{f"p{p}": ms(percentile(latencies, p)) for p in (50, 90, 95, 99)},
+            "max": ms(latencies[-1]) if count else None,
+        },
+    }
+
+
+class Stats:
+    """Latencies and outcomes per operation, shared by all virtual users."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = Counter()
+        self.statuses = defaultdict(Counter)
+
+    def record(self, operation, seconds, status, ok):
+        with self.lock:
+            self.latencies[operation].append(seconds)
+            self.statuses[operation][str(status)] += 1
+            if not ok:
+                self.errors[operation] += 1
+
+    def report(self, elapsed, config):
+        everything = [s for values in self.latencies.values() for s in values]
+        overall = summarize(everything, sum(self.errors.values()))
+        overall["throughput_rps"] = round(len(everything) / elapsed, 2) if elapsed else 0.0
+        operations = {}
+        for operation in sorted(self.latencies):
+            operations[operation] = summarize(self.latencies[operation], self.errors[operation])
+            operations[operation]["status_codes"] = dict(self.statuses[operation])
+        return {"config": config, "elapsed_s": round(elapsed, 3), **overall, "operations": operations}
+
+
+class VirtualUser:
+    """One simulated client: logs in, then picks weighted operations until the deadline."""
+
+    def __init__(self, base_url, username, user_id, product_ids, stats, rng):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port
+        self.username, self.user_id = username, user_id
+        self.product_ids = product_ids
+        self.stats = stats
+        self.rng = rng
+        self.token = None
+        self.task_ids = []
+
+    def request(self, method, path, body=None):
+        headers = {"Accept": "application/json", "Connection": "close"}
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        conn = HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            content = response.read()
+        finally:
+            conn.close()
+        if response.status == 401:
+            self.token = None  # access token expired: log in again on the next operation
+        data = json.loads(content) if content and response.getheader("Content-Type", "").startswith("application/json") else None
+        return response.status, data
+
+    def timed(self, operation, call):
+        start = time.perf_counter()
+        try:
+            status, ok = call()
+        except Exception:
+            status, ok = "exception", False
+        self.stats.record(operation, time.perf_counter() - start, status, ok)
+
+    def run(self, deadline, think_time=0.0):
+        operations, weights = zip(*MIX.items())
+        try:
+            while time.monotonic() < deadline:
+                operation = "login" if self.token is None else self.rng.choices(operations, weights)[0]
+                if operation in ("task_retrieve", "task_update", "task_delete") and not self.task_ids:
+                    operation = "task_create"
+                self.timed(operation, getattr(self, operation))
+                if think_time:
+                    time.sleep(self.rng.uniform(0, 2 * think_time))
+        finally:
+            connections.close_all()
+
+    # operations: each returns (status, ok)
+
+    def login(self):
+        status, data = self.request("POST", "/api/auth/login/", {"username": self.username, "password": PASSWORD})
+        if status == 200:
+            self.token = data["access"]
+        return status, status == 200
+
+    def task_list(self):
+        status, _ = self.request("GET", "/api/tasks/?ordering=due_date")
+        return status, status == 200
+
+    def task_create(self):
+        # due in about an hour, so schedule_reminders has reminders to send
+        due = timezone.now() + timedelta(minutes=self.rng.uniform(58, 62))
+        status, data = self.request("POST", "/api/tasks/", {
+            "product": self.rng.choice(self.product_ids),
+            "title": f"{self.rng.choice(WORDS)} check",
+            "assigned_user": self.user_id,
+            "due_date": due.isoformat(),
+        })
+        if status == 201:
+            self.task_ids.append(data["id"])
+        return status, status == 201
+
+    def task_retrieve(self):
+        status, _ = self.request("GET", f"/api/tasks/{self.rng.choice(self.task_ids)}/")
+        return status, status == 200
+
+    def task_update(self):
+        new_status = self.rng.choice(("inprogress", "completed"))
+        status, _ = self.request("PATCH", f"/api/tasks/{self.rng.choice(self.task_ids)}/", {"status": new_status})
+        return status, status == 200
+
+    def task_delete(self):
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        status, _ = self.request("POST", f"/api/tasks/{task_id}/soft_delete/")
+        return status, status == 200
+
+    def product_search(self):
+        status, _ = self.request("GET", f"/api/products/?search={self.rng.choice(WORDS)}")
+        return status, status == 200
+
+    def schedule_reminders(self):
+        # in-process, as beat would enqueue it; with an eager/in-memory Celery the reminders run inline
+        result = schedule_reminders.delay()
+        return result.state, result.successful()
+
+
+def run_load(base_url, accounts, product_ids, users, duration, think_time=0.0, seed=None):
+    """Run `users` virtual users for `duration` seconds and return the JSON-serializable report."""
+    stats = Stats()
+    rng = random.Random(seed)
+    vus = [VirtualUser(base_url, *accounts[i % len(accounts)], product_ids, stats, random.Random(rng.random()))
+           for i in range(users)]
+    start = time.monotonic()
+    deadline = start + duration
+    threads = [threading.Thread(target=vu.run, args=(deadline, think_time), daemon=True) for vu in vus]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    config = {"users": users, "duration_s": duration, "think_time_s": think_time, "seed": seed, "mix": MIX}
+    return stats.report(time.monotonic() - start, config)
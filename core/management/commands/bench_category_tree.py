@@ -0,0 +1,73 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Category, Product, Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark cascading soft-delete of a category tree: node-by-node walk vs recursive CTE. Data is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=10_000)
+        parser.add_argument("--fanout", type=int, default=10)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            root = self._seed(options["nodes"], options["fanout"])
+            rows = Category.objects.count() + Product.objects.count() + Task.objects.count()
+
+            start = time.perf_counter()
+            self._walk(root)
+            walk = time.perf_counter() - start
+
+            # undo the walk (untimed): restore_tree() only restores what soft_delete_tree() flagged
+            for model in (Category, Product, Task):
+                model.objects.update(is_deleted=False)
+
+            start = time.perf_counter()
+            counts_delete = root.soft_delete_tree()
+            counts = root.restore_tree()
+            cte = (time.perf_counter() - start) / 2
+            assert sum(counts.values()) == sum(counts_delete.values()) == rows
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{options['nodes']} categories, {rows} rows flagged")
+        self.stdout.write(f"{'node-by-node walk':<20} {walk:8.3f}s")
+        self.stdout.write(f"{'recursive CTE':<20} {cte:8.3f}s   ({walk / cte:,.0f}x)")
+
+    def _seed(self, nodes, fanout):
+        user = User.objects.create_user("bench_user", "bench@example.com", "benchpass")
+        root = Category.objects.create(name="root")
+        level, created = [root], 1
+        while created < nodes:
+            batch = [Category(name=f"c{created + i}", parent=level[i // fanout])
+                     for i in range(min(len(level) * fanout, nodes - created))]
+            level = Category.objects.bulk_create(batch, batch_size=5000)
+            created += len(level)
+        products = Product.objects.bulk_create(
+            (Product(name=f"p{c.pk}", category=c, price=Decimal("1.00")) for c in Category.objects.all()),
+            batch_size=5000,
+        )
+        due = timezone.now() + timedelta(days=1)
+        Task.objects.bulk_create(
+            (Task(product=p, assigned_user=user, title="t", due_date=due) for p in products), batch_size=5000,
+        )
+        return root
+
+    def _walk(self, category):
+        # what the per-object soft_delete() API requires today
+        category.soft_delete()
+        for product in category.products.all():
+            product.soft_delete()
+            for task in product.tasks.all():
+                task.soft_delete()
+        for child in category.subcategories.all():
+            self._walk(child)
@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Category, Product, Task
+from core.serializers import TaskSerializer, RowSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark list rendering: TaskSerializer vs RowSerializer (?fields=) in rows/sec. Data is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--fields", default="id,title,status,due_date")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        sparse = options["fields"].split(",")
+        with transaction.atomic():
+            self._seed(rows)
+            qs = Task.objects.filter(is_deleted=False)
+            all_fields = list(TaskSerializer.Meta.fields)
+
+            self._report("TaskSerializer (all fields)", rows,
+                         lambda: TaskSerializer(qs.all(), many=True).data)
+            self._report("RowSerializer (all fields)", rows,
+                         lambda: RowSerializer(TaskSerializer, all_fields).render(qs.values(*all_fields)))
+            self._report(f"RowSerializer ({','.join(sparse)})", rows,
+                         lambda: RowSerializer(TaskSerializer, sparse).render(qs.values(*sparse)))
+            transaction.set_rollback(True)
+
+    def _seed(self, rows):
+        user = User.objects.create_user("bench_user", "bench@example.com", "benchpass")
+        cat = Category.objects.create(name="bench")
+        product = Product.objects.create(name="bench", category=cat, price=Decimal("1.00"), stock=1)
+        due = timezone.now() + timedelta(days=1)
+        Task.objects.bulk_create(
+            (Task(product=product, assigned_user=user, title=f"task {i}", description="benchmark row",
+                  due_date=due + timedelta(seconds=i)) for i in range(rows)),
+            batch_size=5000,
+        )
+
+    def _report(self, label, rows, fn):
+        start = time.perf_counter()
+        data = fn()
+        elapsed = time.perf_counter() - start
+        assert len(data) == rows
+        self.stdout.write(f"{label:<45} {elapsed:8.3f}s {rows / elapsed:12,.0f} rows/sec")
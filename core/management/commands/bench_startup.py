@@ -0,0 +1,69 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# role -> (settings module, what a cold process of that role loads before doing work)
+ROLES = {
+    "web": ("taskprod.settings",
+            "import django; django.setup(); from django.core.checks import run_checks; run_checks(); "
+            "import taskprod.wsgi; from django.urls import get_resolver; get_resolver().url_patterns"),
+    "worker": ("taskprod.settings_worker",
+               "import django; django.setup(); from django.core.checks import run_checks; run_checks(); "
+               "from taskprod.celery import app; app.loader.import_default_modules()"),
+    "beat": ("taskprod.settings_beat",
+             "import django; django.setup(); from django.core.checks import run_checks; run_checks(); "
+             "from taskprod.celery import app; app.loader.import_default_modules(); "
+             "import django_celery_beat.schedulers"),
+    "command": ("taskprod.settings_worker",
+                "import django; django.setup(); from django.core.management import load_command_class; "
+                "load_command_class('core', 'create_admin')"),
+}
+
+
+def import_time_ms(stderr):
+    """Sum of the cumulative times of top-level imports in `python -X importtime` output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith(" ") and not name.startswith("  ") and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total / 1000
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time per process role (python -X importtime in fresh interpreters)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--roles", default=",".join(ROLES))
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--json", action="store_true", help="print results as JSON")
+
+    def handle(self, *args, **options):
+        results = {}
+        for role in options["roles"].split(","):
+            settings_module, code = ROLES[role]
+            env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+            walls, imports = [], []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                                      cwd=settings.BASE_DIR, capture_output=True, text=True, check=True)
+                walls.append((time.perf_counter() - start) * 1000)
+                imports.append(import_time_ms(proc.stderr))
+            results[role] = {"settings": settings_module,
+                             "wall_ms": round(statistics.median(walls), 1),
+                             "import_ms": round(statistics.median(imports), 1)}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for role, r in results.items():
+            self.stdout.write(f"{role:<8} {r['settings']:<26} wall {r['wall_ms']:8.1f} ms   imports {r['import_ms']:8.1f} ms")
@@ -0,0 +1,58 @@
+import json
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.test.utils import setup_databases, teardown_databases
+
+from core.loadtest import run_load, seed
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = ("Drive mixed API traffic (login, task CRUD, product search, reminder scheduling) at N concurrent "
+            "virtual users against an in-process server and report throughput, latency percentiles and errors "
+            "as JSON. Run with --settings=taskprod.settings_loadtest.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+        parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+        parser.add_argument("--think-time", type=float, default=0, help="mean pause between operations (seconds)")
+        parser.add_argument("--products", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        if not settings.CELERY_TASK_ALWAYS_EAGER or "locmem" not in settings.CACHES["default"]["BACKEND"]:
+            raise CommandError("loadtest needs the in-process stack: use --settings=taskprod.settings_loadtest")
+
+        # a fresh test_* database, never the configured one
+        old_config = setup_databases(verbosity=0, interactive=False)
+        httpd = None
+        try:
+            accounts, product_ids = seed(options["users"], products=options["products"])
+            httpd = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+            httpd.set_app(get_internal_wsgi_application())
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            host, port = httpd.server_address[:2]
+
+            report = run_load(f"http://{host}:{port}", accounts, product_ids, options["users"],
+                              options["duration"], options["think_time"], options["seed"])
+            report["config"]["database"] = settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1]
+        finally:
+            if httpd is not None:
+                httpd.shutdown()
+                httpd.server_close()
+            teardown_databases(old_config, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,141 @@
+"""
+Prometheus instrumentation for the API and the Celery workers.
+
+With several gunicorn/celery processes, set PROMETHEUS_MULTIPROC_DIR to a directory
+shared by the processes of one container/host and emptied when it starts (the files
+are named by PID, and PIDs repeat across containers, so never share it between them);
+prometheus_client's multiprocess collector then aggregates every process's samples.
+The web container serves its processes at /metrics; a Celery worker serves its pool's
+on settings.METRICS_WORKER_PORT (see taskprod/celery.py).
+"""
+import logging
+import os
+import time
+from contextlib import ExitStack
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess, start_http_server)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+API_LATENCY = Histogram(
+    "api_request_latency_seconds", "API request latency by viewset and action.",
+    ["view", "action", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+API_QUERIES = Histogram(
+    "api_request_db_queries", "Database queries per API request.",
+    ["view", "action"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+REMINDER_BATCH_SIZE = Histogram(
+    "reminder_schedule_batch_size", "Reminders enqueued per schedule_reminders run.",
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+REMINDER_LAG = Histogram(
+    "reminder_dispatch_lag_seconds",
+    "How late a reminder was sent relative to its target time (one hour before due_date).",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+REMINDER_OUTCOMES = Counter(
+    "task_reminders", "send_task_reminder results.", ["outcome"],
+)
+
+
+class MetricsMiddleware:
+    """Records latency and query count per viewset action."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(count_query))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        labels = getattr(request, "_metrics_labels", None)
+        if labels is not None:
+            API_LATENCY.labels(*labels, response.status_code).observe(elapsed)
+            API_QUERIES.labels(*labels).observe(queries[0])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        cls = getattr(view_func, "cls", None)
+        method = request.method.lower()
+        if cls is None:
+            request._metrics_labels = (view_func.__name__, method)
+        else:
+            # viewsets map methods to actions (list/retrieve/reserve/...); plain APIViews use the method
+            actions = getattr(view_func, "actions", None) or {}
+            request._metrics_labels = (cls.__name__, actions.get(method, method))
+        return None
+
+
+class CeleryQueueCollector:
+    """Broker queue depth, read at scrape time (passive queue_declare)."""
+
+    def __init__(self, app, queues):
+        self.app = app
+        self.queues = queues
+
+    def collect(self):
+        depth = GaugeMetricFamily("celery_queue_depth", "Messages waiting in the Celery queue.", labels=["queue"])
+        try:
+            with self.app.connection_for_read() as conn:
+                conn.ensure_connection(max_retries=1)
+                channel = conn.default_channel
+                for queue in self.queues:
+                    depth.add_metric([queue], channel.queue_declare(queue=queue, passive=True).message_count)
+        except Exception:
+            logger.warning("could not read Celery queue depth", exc_info=True)
+            return
+        yield depth
+
+
+def process_registry():
+    """This process's metrics, or with PROMETHEUS_MULTIPROC_DIR those of every process writing there."""
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def start_worker_server(port):
+    """Serve the worker pool's metrics over HTTP from the worker's main process."""
+    return start_http_server(port, registry=process_registry())
+
+
+def metrics_view(request):
+    output = generate_latest(process_registry())
+
+    queues = getattr(settings, "METRICS_CELERY_QUEUES", [])
+    if queues:
+        from taskprod.celery import app
+
+        broker = CollectorRegistry()
+        broker.register(CeleryQueueCollector(app, queues))
+        output += generate_latest(broker)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
+
+
+@worker_process_shutdown.connect
+def _mark_worker_process_dead(pid=None, **kwargs):
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
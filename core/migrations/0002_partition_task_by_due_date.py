@@ -0,0 +1,96 @@
+# Converts core_task into a table range-partitioned by due_date month (Postgres only).
+# Postgres requires the partition key in the primary key, so the table's PK becomes
+# (id, due_date); Django keeps treating `id` as the primary key.
+
+from django.db import migrations
+
+MONTHS_AHEAD = 3
+
+
+def partition_task_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    execute = schema_editor.execute
+    execute('ALTER TABLE "core_task" RENAME TO "core_task_old"')
+    execute(
+        'CREATE TABLE "core_task" (LIKE "core_task_old" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) '
+        "PARTITION BY RANGE (due_date)"
+    )
+    execute('ALTER TABLE "core_task" ADD CONSTRAINT "core_task_pkey_id_due_date" PRIMARY KEY (id, due_date)')
+    execute('CREATE TABLE "core_task_default" PARTITION OF "core_task" DEFAULT')
+
+    # one partition per month from the oldest existing task through MONTHS_AHEAD months from now
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT to_char(m, 'YYYYMM'), m::date, (m + interval '1 month')::date FROM generate_series("
+            "date_trunc('month', LEAST(COALESCE((SELECT min(due_date) FROM core_task_old), now()), now())), "
+            "date_trunc('month', GREATEST(COALESCE((SELECT max(due_date) FROM core_task_old), now()), "
+            f"now() + interval '{MONTHS_AHEAD} months')), interval '1 month') AS m"
+        )
+        months = cursor.fetchall()
+    for suffix, start, end in months:
+        execute(
+            f'CREATE TABLE "core_task_p{suffix}" PARTITION OF "core_task" FOR VALUES FROM (%s) TO (%s)',
+            [start.isoformat(), end.isoformat()],
+        )
+
+    execute('INSERT INTO "core_task" SELECT * FROM "core_task_old"')
+    execute(
+        "SELECT setval(pg_get_serial_sequence('core_task', 'id'), "
+        "COALESCE((SELECT max(id) FROM core_task), 0) + 1, false)"
+    )
+    execute('DROP TABLE "core_task_old"')
+    # indexes and FKs are created after the copy (and once the old table's names are gone)
+    execute(
+        'ALTER TABLE "core_task" ADD CONSTRAINT "core_task_product_id_fk_core_product_id" '
+        'FOREIGN KEY (product_id) REFERENCES "core_product" (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    execute(
+        'ALTER TABLE "core_task" ADD CONSTRAINT "core_task_assigned_user_id_fk_auth_user_id" '
+        'FOREIGN KEY (assigned_user_id) REFERENCES "auth_user" (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    execute('CREATE INDEX "core_task_product_id_idx" ON "core_task" (product_id)')
+    execute('CREATE INDEX "core_task_assigned_user_id_idx" ON "core_task" (assigned_user_id)')
+    execute('CREATE INDEX "core_task_due_date_idx" ON "core_task" (due_date)')
+
+
+def unpartition_task_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    execute = schema_editor.execute
+    execute('ALTER TABLE "core_task" RENAME TO "core_task_partitioned"')
+    execute(
+        'CREATE TABLE "core_task" (LIKE "core_task_partitioned" INCLUDING DEFAULTS INCLUDING IDENTITY '
+        "INCLUDING CONSTRAINTS)"
+    )
+    execute('ALTER TABLE "core_task" ADD PRIMARY KEY (id)')
+    execute('INSERT INTO "core_task" SELECT * FROM "core_task_partitioned"')
+    execute(
+        "SELECT setval(pg_get_serial_sequence('core_task', 'id'), "
+        "COALESCE((SELECT max(id) FROM core_task), 0) + 1, false)"
+    )
+    execute('DROP TABLE "core_task_partitioned" CASCADE')
+    execute(
+        'ALTER TABLE "core_task" ADD CONSTRAINT "core_task_product_id_fk_core_product_id" '
+        'FOREIGN KEY (product_id) REFERENCES "core_product" (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    execute(
+        'ALTER TABLE "core_task" ADD CONSTRAINT "core_task_assigned_user_id_fk_auth_user_id" '
+        'FOREIGN KEY (assigned_user_id) REFERENCES "auth_user" (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    execute('CREATE INDEX "core_task_product_id_idx" ON "core_task" (product_id)')
+    execute('CREATE INDEX "core_task_assigned_user_id_idx" ON "core_task" (assigned_user_id)')
+
+
+class Migration(migrations.Migration):
+
+    # the table swap has to happen in one transaction
+    atomic = True
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_task_table, unpartition_task_table),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:16
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    # best available approximation for tasks completed before the field existed
+    Task = apps.get_model("core", "Task")
+    Task.objects.filter(status="completed").update(completed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_partition_task_by_due_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
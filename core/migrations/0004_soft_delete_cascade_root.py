@@ -0,0 +1,56 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:48
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_cascade_root(apps, schema_editor):
+    # rows deleted by a cascade before this field existed carry the root category's updated_at
+    Category = apps.get_model("core", "Category")
+    Product = apps.get_model("core", "Product")
+    Task = apps.get_model("core", "Task")
+    children = defaultdict(list)
+    for pk, parent_id in Category.objects.values_list("id", "parent_id"):
+        children[parent_id].append(pk)
+    for root_id, stamp in Category.objects.filter(is_deleted=True).values_list("id", "updated_at"):
+        subtree, stack = set(), [root_id]
+        while stack:
+            pk = stack.pop()
+            if pk not in subtree:
+                subtree.add(pk)
+                stack.extend(children[pk])
+        flagged = {"is_deleted": True, "updated_at": stamp, "cascade_root": None}
+        Category.objects.filter(id__in=subtree, **flagged).update(cascade_root=root_id)
+        Product.objects.filter(category_id__in=subtree, **flagged).update(cascade_root=root_id)
+        Task.objects.filter(product__category_id__in=subtree, **flagged).update(cascade_root=root_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_task_completed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="cascade_root",
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name="+", to="core.category"),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="cascade_root",
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name="+", to="core.category"),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="cascade_root",
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name="+", to="core.category"),
+        ),
+        migrations.RunPython(backfill_cascade_root, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,20 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.expressions import RawSQL
 from django.conf import settings
 from django.utils import timezone
 
+
+class InsufficientStock(Exception):
+    """
+    Raised when a stock reservation would drive Product.stock below zero.
+    """
+    def __init__(self, product_id, requested):
+        self.product_id = product_id
+        self.requested = requested
+        super().__init__(f"insufficient stock for product {product_id} (requested {requested})")
+
+
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -15,6 +28,9 @@ class TimeStampedModel(models.Model):
     )
     is_active = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
+    # the category whose soft_delete_tree() deleted this row (see Category.cascaded)
+    cascade_root = models.ForeignKey("core.Category", related_name="+", null=True, blank=True,
+                                     editable=False, on_delete=models.SET_NULL)
 
     class Meta:
         abstract = True
@@ -22,12 +38,14 @@ class TimeStampedModel(models.Model):
     def soft_delete(self):
         self.is_deleted = True
         self.is_active = False
-        self.save(update_fields=["is_deleted", "is_active", "updated_at"])
+        self.cascade_root = None
+        self.save(update_fields=["is_deleted", "is_active", "cascade_root", "updated_at"])
 
     def restore(self):
         self.is_deleted = False
         self.is_active = True
-        self.save(update_fields=["is_deleted", "is_active", "updated_at"])
+        self.cascade_root = None
+        self.save(update_fields=["is_deleted", "is_active", "cascade_root", "updated_at"])
 
 
 class Category(TimeStampedModel):
@@ -38,6 +56,64 @@ class Category(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def subtree(self):
+        """
+        Subquery (recursive CTE) selecting the ids of this category and all of its
+        descendants, deleted ones included. Usable as `id__in=category.subtree()`.
+        UNION (not UNION ALL) drops ids already visited, so a parent cycle cannot
+        make the recursion run forever.
+        """
+        table = Category._meta.db_table
+        return RawSQL(
+            'WITH RECURSIVE tree(id) AS ('
+            f'SELECT id FROM "{table}" WHERE id = %s '
+            f'UNION SELECT c.id FROM "{table}" c JOIN tree t ON c.parent_id = t.id'
+            ') SELECT id FROM tree',
+            [self.pk],
+        )
+
+    def tree(self):
+        """Querysets over this category's subtree: its categories, their products and those products' tasks."""
+        subtree = self.subtree()
+        return {
+            "categories": Category.objects.filter(id__in=subtree),
+            "products": Product.objects.filter(category_id__in=subtree),
+            "tasks": Task.objects.filter(product__category_id__in=subtree),
+        }
+
+    def cascaded(self):
+        """
+        The rows this category's soft_delete_tree() flagged (cascade_root = this category)
+        that are still deleted. Rows deleted on their own beforehand have no cascade_root,
+        so restoring the tree leaves them deleted.
+        """
+        return {name: qs.filter(is_deleted=True, cascade_root=self) for name, qs in self.tree().items()}
+
+    def soft_delete_tree(self):
+        """Soft-delete the subtree. Rows that are already deleted are left untouched."""
+        return self._flag_tree({name: qs.filter(is_deleted=False) for name, qs in self.tree().items()}, deleted=True)
+
+    def restore_tree(self):
+        """Undo this category's soft_delete_tree()."""
+        return self._flag_tree(self.cascaded(), deleted=False)
+
+    def _flag_tree(self, querysets, deleted):
+        """
+        Flag the rows of `querysets` with three set-based UPDATEs in one transaction,
+        recording this category as their cascade_root (cleared again on restore).
+        Returns the number of rows updated per model.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            counts = {}
+            for name, qs in querysets.items():
+                values = {"is_deleted": deleted, "cascade_root": self if deleted else None, "updated_at": now}
+                if qs.model is not Task:
+                    values["is_active"] = not deleted
+                counts[name] = qs.update(**values)
+        self.refresh_from_db(fields=["is_deleted", "is_active", "cascade_root", "updated_at"])
+        return counts
+
 
 class Product(TimeStampedModel):
     category = models.ForeignKey(Category, related_name="products", on_delete=models.CASCADE)
@@ -49,6 +125,46 @@ class Product(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def reserve(self, quantity):
+        """
+        Take `quantity` units out of stock with a single conditional UPDATE
+        (stock >= quantity), so concurrent reservations never lose updates.
+        """
+        updated = Product.objects.filter(pk=self.pk, is_deleted=False, stock__gte=quantity) \
+            .update(stock=F("stock") - quantity, updated_at=timezone.now())
+        if not updated:
+            raise InsufficientStock(self.pk, quantity)
+        self.refresh_from_db(fields=["stock", "updated_at"])
+        return self.stock
+
+    def release(self, quantity):
+        """
+        Put `quantity` units back into stock (e.g. a cancelled order).
+        """
+        Product.objects.filter(pk=self.pk).update(stock=F("stock") + quantity, updated_at=timezone.now())
+        self.refresh_from_db(fields=["stock", "updated_at"])
+        return self.stock
+
+    @classmethod
+    def adjust_stock(cls, adjustments):
+        """
+        Apply {product_id: delta} stock changes in one transaction.
+        Negative deltas are conditional on enough stock being left; if any of
+        them fails the whole batch is rolled back. Rows are touched in pk order
+        so concurrent batches lock them in the same order and cannot deadlock.
+        Returns {product_id: new_stock}.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            for product_id in sorted(adjustments):
+                delta = adjustments[product_id]
+                qs = cls.objects.filter(pk=product_id, is_deleted=False)
+                if delta < 0:
+                    qs = qs.filter(stock__gte=-delta)
+                if not qs.update(stock=F("stock") + delta, updated_at=now):
+                    raise InsufficientStock(product_id, -delta)
+            return dict(cls.objects.filter(pk__in=adjustments).values_list("id", "stock"))
+
 
 class Task(models.Model):
     STATUS_PENDING = "pending"
@@ -68,7 +184,10 @@ class Task(models.Model):
     due_date = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
     is_deleted = models.BooleanField(default=False)
+    cascade_root = models.ForeignKey(Category, related_name="+", null=True, blank=True,
+                                     editable=False, on_delete=models.SET_NULL)
 
     class Meta:
         ordering = ["due_date"]
@@ -76,10 +195,24 @@ class Task(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # completed_at follows status so completion times can be aggregated in the database
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "status" in update_fields:
+            if self.status == self.STATUS_COMPLETED and self.completed_at is None:
+                self.completed_at = timezone.now()
+            elif self.status != self.STATUS_COMPLETED:
+                self.completed_at = None
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+
     def soft_delete(self):
         self.is_deleted = True
-        self.save(update_fields=["is_deleted", "updated_at"])
+        self.cascade_root = None
+        self.save(update_fields=["is_deleted", "cascade_root", "updated_at"])
 
     def restore(self):
         self.is_deleted = False
-        self.save(update_fields=["is_deleted", "updated_at"])
+        self.cascade_root = None
+        self.save(update_fields=["is_deleted", "cascade_root", "updated_at"])
@@ -0,0 +1,105 @@
+"""
+Monthly range partitions of core_task on due_date (Postgres only).
+
+The partitioned table itself is created by migration 0002. Partitions are
+named core_task_pYYYYMM and cover [first of month, first of next month);
+core_task_default catches anything outside the created months. On other
+database vendors every function here is a no-op.
+"""
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Task
+
+TABLE = Task._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(value, offset=0):
+    months = value.year * 12 + value.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Names of the monthly partitions currently attached, oldest first."""
+    if not is_partitioned():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass AND c.relname <> %s ORDER BY c.relname",
+            [TABLE, DEFAULT_PARTITION],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_partition(month):
+    """
+    Create and attach the partition for `month` unless it exists. Rows that already
+    landed in the default partition for that range are moved into it first, so the
+    ATTACH never fails on them.
+    """
+    month = month_start(month)
+    name = partition_name(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        bounds = [month, month_start(month, 1)]
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE due_date >= %s AND due_date < %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            bounds,
+        )
+        cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', bounds)
+    return True
+
+
+def ensure_partitions(months_ahead, today=None):
+    """Make sure partitions exist from the current month through `months_ahead` months ahead."""
+    if not is_partitioned():
+        return []
+    current = month_start(today or timezone.now())
+    return [partition_name(month_start(current, i)) for i in range(months_ahead + 1)
+            if create_partition(month_start(current, i))]
+
+
+def detach_completed_partitions(before, drop=False):
+    """
+    Detach monthly partitions that end on or before `before` and hold only completed or
+    deleted tasks. Detaching is a catalog change instead of a row-by-row DELETE; the
+    detached table is kept for archiving unless `drop` is set.
+    """
+    cutoff = month_start(before)
+    detached = []
+    for name in list_partitions():
+        month = date(int(name[-6:-2]), int(name[-2:]), 1)
+        if month_start(month, 1) > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{name}" WHERE status <> %s AND NOT is_deleted)',
+                [Task.STATUS_COMPLETED],
+            )
+            if cursor.fetchone()[0]:
+                continue
+            cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+        detached.append(name)
+    return detached
@@ -0,0 +1,99 @@
+"""
+Faster JSON (orjson) and compact binary (MessagePack) renderers.
+
+Both libraries are optional: ORJSONRenderer falls back to DRF's JSONRenderer
+when orjson isn't installed, and the MessagePack pair is only enabled in
+settings when msgpack is importable.
+"""
+import math
+import re
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+# Everything orjson doesn't serialize natively (Decimal, timedelta, lazy strings,
+# querysets, ...) goes through DRF's encoder, so the output stays the same as JSONRenderer's.
+_default = JSONEncoder().default
+
+# Floats orjson formats differently from json.dumps: 1e16 / 1e-7 / 0.00001 where json.dumps
+# writes 1e+16 / 1e-07 / 1e-05. Only matched in value position, so strings rarely trip it.
+_FLOAT_FORMS = re.compile(rb"(?:^|[:,\[])-?(?:[0-9.]+e-?[0-9]|0\.0000)")
+_SCALARS = frozenset({str, int, bool, type(None)})
+
+
+def _orjson_default(obj):
+    value = _default(obj)
+    if isinstance(value, float) and not math.isfinite(value):
+        raise TypeError("non-finite float")  # e.g. Decimal("NaN"): let JSONRenderer reject it
+    return value
+
+
+def _has_non_finite(data):
+    stack = [data]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        value = pop()
+        if type(value) in _SCALARS:  # the bulk of API data: one set lookup per value
+            continue
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            push(value.values())
+        elif isinstance(value, (list, tuple)):
+            push(value)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using orjson for the default compact/unicode output; the bytes match
+    JSONRenderer's for str-keyed data. Pretty-printed (indent) or ASCII-only output,
+    values orjson rejects (e.g. integers over 64 bits), floats in exponent range and
+    NaN/Infinity (which JSONRenderer refuses) are rendered by JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or not self.compact or self.ensure_ascii \
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_orjson_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN/Infinity as null
+        if _FLOAT_FORMS.search(ret) or (b"null" in ret and _has_non_finite(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+        # same javascript-safe escaping JSONRenderer applies
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Binary renderer for internal service-to-service clients (Accept: application/msgpack).
+    """
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Decimal/datetime/UUID etc. are sent exactly as JSONRenderer would encode them
+        return msgpack.packb(data, default=_default, use_bin_type=True)
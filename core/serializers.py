@@ -1,4 +1,9 @@
+import decimal
+from functools import lru_cache
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings, ISO_8601
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.contrib.auth.tokens import default_token_generator
@@ -37,6 +42,13 @@ class CategorySerializer(serializers.ModelSerializer):
                   "is_active", "is_deleted", "created_at", "updated_at", "created_by", "updated_by")
         read_only_fields = ("is_deleted", "created_at", "updated_at", "created_by", "updated_by")
 
+    def validate_parent(self, value):
+        # a category can't become its own ancestor
+        if value is not None and self.instance is not None and \
+                Category.objects.filter(id__in=self.instance.subtree(), pk=value.pk).exists():
+            raise serializers.ValidationError("A category cannot be moved under itself or one of its subcategories.")
+        return value
+
 
 class ProductSerializer(serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.filter(is_deleted=False))
@@ -48,6 +60,50 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = ("is_deleted", "created_at", "updated_at", "created_by", "updated_by")
 
 
+class StockQuantitySerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_deleted=False))
+    delta = serializers.IntegerField()
+
+
+class StockAdjustmentBatchSerializer(serializers.Serializer):
+    adjustments = StockAdjustmentSerializer(many=True, allow_empty=False)
+
+    def get_deltas(self):
+        # several lines for the same product are folded into one UPDATE
+        deltas = {}
+        for item in self.validated_data["adjustments"]:
+            deltas[item["product"].pk] = deltas.get(item["product"].pk, 0) + item["delta"]
+        return deltas
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    # range applies to Task.created_at; category includes its whole subtree.
+    # Tasks of soft-deleted products are left out of every report.
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    bucket = serializers.ChoiceField(choices=["day", "week", "month"], default="day")
+    group = serializers.ChoiceField(choices=["product", "category"], default="product")
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.filter(is_deleted=False), required=False)
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_deleted=False), required=False)
+
+    def filter(self, queryset):
+        params = self.validated_data
+        queryset = queryset.filter(product__is_deleted=False)
+        if "start" in params:
+            queryset = queryset.filter(created_at__gte=params["start"])
+        if "end" in params:
+            queryset = queryset.filter(created_at__lt=params["end"])
+        if "category" in params:
+            queryset = queryset.filter(product__category_id__in=params["category"].subtree())
+        if "product" in params:
+            queryset = queryset.filter(product=params["product"])
+        return queryset
+
+
 class TaskSerializer(serializers.ModelSerializer):
     assigned_user = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(is_active=True))
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_deleted=False))
@@ -55,8 +111,8 @@ class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ("id", "product", "title", "description", "status", "assigned_user", "due_date",
-                  "created_at", "updated_at", "is_deleted")
-        read_only_fields = ("created_at", "updated_at", "is_deleted")
+                  "created_at", "updated_at", "completed_at", "is_deleted")
+        read_only_fields = ("created_at", "updated_at", "completed_at", "is_deleted")
 
     def validate_due_date(self, value):
         if value <= timezone.now():
@@ -64,6 +120,87 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
+class RowSerializer:
+    """
+    Fast read path for list endpoints: renders `.values()` rows for a sparse set of
+    a ModelSerializer's fields (`?fields=id,title,status`) with per-field converters
+    compiled once, instead of building model instances and running
+    ModelSerializer.to_representation per row. Output matches the ModelSerializer.
+    """
+
+    def __init__(self, serializer_class, fields):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.columns, self.plan = _compile_row_plan(serializer_class, tuple(fields), tz)
+
+    @classmethod
+    def from_param(cls, serializer_class, param):
+        fields = [name.strip() for name in param.split(",") if name.strip()]
+        readable = _readable_fields(serializer_class)
+        unknown = [name for name in fields if name not in readable]
+        if not fields or unknown:
+            raise serializers.ValidationError({"fields": f"unknown or unsupported fields: {', '.join(unknown)}"
+                                               if unknown else "no fields given"})
+        return cls(serializer_class, list(dict.fromkeys(fields)))
+
+    def render(self, rows):
+        plan = self.plan
+        data = []
+        for row in rows:
+            item = {}
+            for name, convert in plan:
+                value = row[name]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=None)
+def _readable_fields(serializer_class):
+    """Field name -> DRF field, for fields that map 1:1 onto a concrete model column."""
+    model = serializer_class.Meta.model
+    columns = {f.name for f in model._meta.concrete_fields}
+    return {name: field for name, field in serializer_class().fields.items()
+            if not field.write_only and field.source == name and name in columns}
+
+
+@lru_cache(maxsize=256)
+def _compile_row_plan(serializer_class, fields, tz):
+    readable = _readable_fields(serializer_class)
+    return fields, tuple((name, _converter(readable[name], tz)) for name in fields)
+
+
+def _converter(field, tz):
+    """Return a value -> representation callable, or None when the db value is already it."""
+    if isinstance(field, serializers.DateTimeField):
+        if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601 or tz is None \
+                or hasattr(field, "timezone"):
+            return field.to_representation
+
+        def convert_datetime(value):
+            value = value.astimezone(tz).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return convert_datetime
+
+    if isinstance(field, serializers.DecimalField):
+        if not getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING) or field.localize \
+                or field.normalize_output or field.decimal_places is None:
+            return field.to_representation
+        quantum = decimal.Decimal(".1") ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+
+        def convert_decimal(value):
+            return "{:f}".format(value.quantize(quantum, rounding=field.rounding, context=context))
+        return convert_decimal
+
+    # ids, foreign keys (.values() returns the raw pk), text, choices and flags are passed through
+    if isinstance(field, (serializers.IntegerField, serializers.CharField, serializers.BooleanField,
+                          serializers.ChoiceField, serializers.PrimaryKeyRelatedField)):
+        return None
+    return field.to_representation
+
+
 class PasswordResetRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
@@ -1,17 +1,31 @@
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 from django.core.mail import send_mail
-from .models import Task
+from taskprod.db_router import use_replica
+from .models import Category, Task
+from . import jobs, partitions
+
+# reminders are meant to go out this long before due_date
+REMINDER_LEAD = timedelta(hours=1)
+
+# Both tasks only read from the database, so they run against a replica when one is configured.
 
 @shared_task
+@use_replica()
 def send_task_reminder(task_id):
+    # prometheus_client is loaded on the first reminder, not at worker/beat startup
+    from .metrics import REMINDER_LAG, REMINDER_OUTCOMES
+
     try:
         task = Task.objects.get(pk=task_id)
     except Task.DoesNotExist:
+        REMINDER_OUTCOMES.labels("not_found").inc()
         return {"status": "not_found", "task_id": task_id}
 
     if task.is_deleted or task.status == Task.STATUS_COMPLETED:
+        REMINDER_OUTCOMES.labels("skipped").inc()
         return {"status": "skipped", "reason": "deleted_or_completed"}
 
     subject = f"Reminder: '{task.title}' due at {task.due_date}"
@@ -19,21 +33,69 @@ def send_task_reminder(task_id):
     recipient = [task.assigned_user.email] if task.assigned_user.email else []
     if recipient:
         send_mail(subject, body, None, recipient, fail_silently=False)
+        REMINDER_OUTCOMES.labels("sent").inc()
+        REMINDER_LAG.observe(max((timezone.now() - (task.due_date - REMINDER_LEAD)).total_seconds(), 0))
         return {"status": "sent", "task_id": task_id}
+    REMINDER_OUTCOMES.labels("no_email").inc()
     return {"status": "no_email", "task_id": task_id}
 
 
 @shared_task
+@use_replica()
 def schedule_reminders():
     """
     Run periodically (via Celery Beat). Find tasks due ~1 hour from now and schedule send_task_reminder.
     We look for tasks due between now+59 and now+61 minutes to account for schedule frequency.
     """
+    from .metrics import REMINDER_BATCH_SIZE
+
     now = timezone.now()
     window_start = now + timedelta(minutes=59)
     window_end = now + timedelta(minutes=61)
     qs = Task.objects.filter(is_deleted=False, status__in=[Task.STATUS_PENDING, Task.STATUS_INPROGRESS],
                              due_date__gte=window_start, due_date__lte=window_end)
-    for t in qs:
-        send_task_reminder.delay(t.id)
-    return {"scheduled": qs.count()}
+    scheduled = 0
+    for task_id in qs.values_list("id", flat=True):
+        send_task_reminder.delay(task_id)
+        scheduled += 1
+    REMINDER_BATCH_SIZE.observe(scheduled)
+    return {"scheduled": scheduled}
+
+
+@shared_task
+def maintain_task_partitions():
+    """
+    Run daily (via Celery Beat). Create Task partitions TASK_PARTITION_MONTHS_AHEAD months ahead and,
+    if TASK_PARTITION_RETENTION_MONTHS is set, detach older partitions that only hold completed/deleted tasks.
+    """
+    created = partitions.ensure_partitions(settings.TASK_PARTITION_MONTHS_AHEAD)
+    detached = []
+    if settings.TASK_PARTITION_RETENTION_MONTHS:
+        cutoff = partitions.month_start(timezone.now(), -settings.TASK_PARTITION_RETENTION_MONTHS)
+        detached = partitions.detach_completed_partitions(cutoff)
+    return {"created": created, "detached": detached}
+
+
+@shared_task(bind=True)
+def restore_category_tree(self, category_id, user_id=None):
+    """
+    Background job: undo a category's cascading soft delete (the chunked counterpart of
+    Category.restore_tree). Only rows that cascade flagged are restored; rows deleted on
+    their own beforehand stay deleted. Rows are updated in chunks of JOB_CHUNK_SIZE,
+    each chunk in its own transaction.
+    """
+    ids = {qs.model: list(qs.order_by("id").values_list("id", flat=True))
+           for qs in Category.objects.get(pk=category_id).cascaded().values()}
+    now = timezone.now()
+
+    def restore(chunk):
+        model, pks = chunk
+        if model is Task:
+            return Task.objects.filter(pk__in=pks).update(is_deleted=False, cascade_root=None, updated_at=now)
+        values = {"is_deleted": False, "is_active": True, "cascade_root": None, "updated_at": now}
+        if user_id is not None:
+            values["updated_by_id"] = user_id
+        return model.objects.filter(pk__in=pks).update(**values)
+
+    chunks = [(model, pks) for model, model_ids in ids.items() for pks in jobs.chunked(model_ids)]
+    return jobs.run_chunked(self, chunks, sum(len(model_ids) for model_ids in ids.values()), restore)
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.models import Category, Product, Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def client_and_tasks():
+    cache.clear()
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    root = Category.objects.create(name="root")
+    child = Category.objects.create(name="child", parent=root)
+    other = Category.objects.create(name="other")
+    p_root, p_child, p_other = (Product.objects.create(name=f"p-{c.name}", category=c, price=Decimal("1.00"))
+                                for c in (root, child, other))
+    now = timezone.now()
+
+    def task(product, created, status=Task.STATUS_PENDING, overdue=False, hours_to_complete=None):
+        t = Task.objects.create(product=product, assigned_user=admin, title="t", status=status,
+                                due_date=now - timedelta(days=1) if overdue else now + timedelta(days=1))
+        values = {"created_at": created}
+        if hours_to_complete is not None:
+            values["completed_at"] = created + timedelta(hours=hours_to_complete)
+        Task.objects.filter(pk=t.pk).update(**values)
+
+    day1 = datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc)
+    day2 = datetime(2026, 3, 3, 9, tzinfo=dt_timezone.utc)
+    task(p_root, day1, Task.STATUS_COMPLETED, hours_to_complete=2)
+    task(p_root, day1, overdue=True)
+    task(p_child, day2, Task.STATUS_COMPLETED, hours_to_complete=4)
+    task(p_other, day2, overdue=True)
+
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client, root, p_root, p_child
+
+
+@pytest.mark.django_db
+def test_task_analytics_series(client_and_tasks):
+    client, root, _, _ = client_and_tasks
+    r = client.get("/api/tasks/analytics/", {"bucket": "day", "category": root.pk, "start": "2026-03-01T00:00:00Z"})
+    assert r.status_code == 200
+    assert r.data["totals"] == {"total": 3, "completed": 2, "overdue": 1,
+                                "completion_rate": 0.6667, "avg_completion_seconds": 10800.0}
+    assert [(row["total"], row["completed"], row["avg_completion_seconds"]) for row in r.data["series"]] == \
+        [(2, 1, 7200.0), (1, 1, 14400.0)]
+
+    r = client.get("/api/tasks/analytics/", {"bucket": "month"})
+    assert len(r.data["series"]) == 1 and r.data["totals"]["overdue"] == 2
+    assert client.get("/api/tasks/analytics/", {"bucket": "year"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_product_analytics_and_cache(client_and_tasks):
+    client, root, p_root, p_child = client_and_tasks
+    r = client.get("/api/products/analytics/", {"category": root.pk})
+    assert [(row["name"], row["total"], row["completion_rate"]) for row in r.data["results"]] == \
+        [("p-root", 2, 0.5), ("p-child", 1, 1.0)]
+
+    # a category's row covers its subcategories; totals still count every task once
+    r = client.get("/api/products/analytics/", {"group": "category"})
+    assert [(row["name"], row["total"], row["completed"], row["overdue"]) for row in r.data["results"]] == \
+        [("root", 3, 2, 1), ("child", 1, 1, 0), ("other", 1, 0, 1)]
+    assert r.data["results"][0]["avg_completion_seconds"] == 10800.0
+    assert r.data["totals"]["total"] == 4
+
+    r = client.get("/api/products/analytics/", {"group": "category", "category": root.pk})
+    assert [(row["name"], row["total"]) for row in r.data["results"]] == [("root", 3), ("child", 1)]
+    r = client.get("/api/products/analytics/", {"group": "category", "category": root.subcategories.get().pk})
+    assert [(row["name"], row["total"]) for row in r.data["results"]] == [("child", 1)]
+
+    # served from cache until the TTL expires
+    Task.objects.all().delete()
+    r = client.get("/api/products/analytics/", {"group": "category"})
+    assert r.data["totals"]["total"] == 4
+
+
+@pytest.mark.django_db
+def test_reports_skip_tasks_of_deleted_products(client_and_tasks):
+    client, _, _, p_child = client_and_tasks
+    p_child.soft_delete()
+    tasks = client.get("/api/tasks/analytics/", {"bucket": "month"}).data["totals"]
+    products = client.get("/api/products/analytics/").data["totals"]
+    assert tasks == products
+    assert tasks["total"] == 3 and tasks["completed"] == 1
+
+
+@pytest.mark.django_db
+def test_completed_at_follows_status(client_and_tasks):
+    task = Task.objects.filter(status=Task.STATUS_PENDING).first()
+    task.status = Task.STATUS_COMPLETED
+    task.save(update_fields=["status"])
+    task.refresh_from_db()
+    assert task.completed_at is not None
+    task.status = Task.STATUS_INPROGRESS
+    task.save()
+    task.refresh_from_db()
+    assert task.completed_at is None
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.models import Category, Product, Task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def tree():
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    root = Category.objects.create(name="root")
+    child = Category.objects.create(name="child", parent=root)
+    grandchild = Category.objects.create(name="grandchild", parent=child)
+    other = Category.objects.create(name="other")
+    due = timezone.now() + timedelta(days=1)
+    for cat in (root, child, grandchild, other):
+        product = Product.objects.create(name=f"p-{cat.name}", category=cat, price=Decimal("1.00"))
+        Task.objects.create(product=product, assigned_user=user, title=f"t-{cat.name}", due_date=due)
+    return root, child, other
+
+
+@pytest.mark.django_db
+def test_soft_delete_and_restore_subtree(tree):
+    root, child, other = tree
+    with CaptureQueriesContext(connection) as queries:
+        counts = child.soft_delete_tree()
+    assert counts == {"categories": 2, "products": 2, "tasks": 2}
+    assert len([q for q in queries if q["sql"].startswith("UPDATE")]) == 3
+    assert child.is_deleted and not child.is_active
+
+    assert set(Category.objects.filter(is_deleted=True).values_list("name", flat=True)) == {"child", "grandchild"}
+    assert set(Task.objects.filter(is_deleted=True).values_list("title", flat=True)) == {"t-child", "t-grandchild"}
+    assert not Product.objects.filter(category__in=[root, other], is_deleted=True).exists()
+
+    assert root.restore_tree() == {"categories": 0, "products": 0, "tasks": 0}
+    assert child.restore_tree() == {"categories": 2, "products": 2, "tasks": 2}
+    assert not Task.objects.filter(is_deleted=True).exists()
+
+
+@pytest.mark.django_db
+def test_restore_tree_keeps_rows_deleted_beforehand(tree):
+    root, child, _ = tree
+    Task.objects.get(title="t-grandchild").soft_delete()
+    Category.objects.get(name="grandchild").soft_delete()
+    assert root.soft_delete_tree() == {"categories": 2, "products": 3, "tasks": 2}
+    assert root.restore_tree() == {"categories": 2, "products": 3, "tasks": 2}
+    assert set(Category.objects.filter(is_deleted=True).values_list("name", flat=True)) == {"grandchild"}
+    assert set(Task.objects.filter(is_deleted=True).values_list("title", flat=True)) == {"t-grandchild"}
+
+
+@pytest.mark.django_db
+def test_restore_tree_survives_later_writes(tree):
+    root, _, _ = tree
+    root.soft_delete_tree()
+    # writes that touch updated_at after the cascade (admin edit, stock release)
+    Product.objects.get(name="p-child").release(5)
+    task = Task.objects.get(title="t-grandchild")
+    task.description = "edited while deleted"
+    task.save()
+    assert root.restore_tree() == {"categories": 3, "products": 3, "tasks": 3}
+    assert not Task.objects.filter(is_deleted=True).exists()
+    assert not Product.objects.filter(cascade_root__isnull=False).exists()
+
+
+@pytest.mark.django_db
+def test_parent_cycles_are_rejected_and_harmless(tree):
+    root, child, _ = tree
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    client = APIClient()
+    client.force_authenticate(admin)
+    grandchild = Category.objects.get(name="grandchild")
+    for parent in (root, grandchild):
+        r = client.patch(f"/api/categories/{root.pk}/", {"parent": parent.pk}, format="json")
+        assert r.status_code == 400
+    assert client.patch(f"/api/categories/{grandchild.pk}/", {"parent": None}, format="json").status_code == 200
+
+    # a cycle that got into the table anyway must not make the CTE recurse forever
+    Category.objects.filter(pk=root.pk).update(parent=child)
+    assert root.soft_delete_tree()["categories"] == 2
+
+
+@pytest.mark.django_db
+def test_category_soft_delete_and_restore_endpoints(tree):
+    root, _, other = tree
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username="u1"))
+    assert client.post(f"/api/categories/{root.pk}/soft_delete/").status_code == 403
+    assert not Task.objects.filter(is_deleted=True).exists()
+
+    client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "adminpass"))
+    r = client.post(f"/api/categories/{root.pk}/soft_delete/")
+    assert r.status_code == 200
+    assert r.data["tasks"] == 3
+    assert [t["title"] for t in client.get("/api/tasks/").json()] == ["t-other"]
+
+    r = client.post(f"/api/categories/{root.pk}/restore/")
+    assert r.status_code == 200
+    assert r.data["tasks"] == 3
+    assert not Task.objects.filter(is_deleted=True).exists()
@@ -0,0 +1,80 @@
+import pytest
+from decimal import Decimal
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from core.models import Category, Product, Task
+from taskprod.db_router import ReplicaRouter, use_replica, use_primary
+
+User = get_user_model()
+
+
+@pytest.fixture
+def replicas(settings):
+    # "replica" is a test mirror of default (see taskprod/test_settings.py)
+    settings.DATABASE_REPLICAS = ["replica"]
+    cache.clear()
+
+
+def test_router_defaults_to_primary(replicas):
+    router = ReplicaRouter()
+    assert router.db_for_read(Task) == "default"
+    with use_replica():
+        assert router.db_for_read(Task) == "replica"
+        with use_primary():
+            assert router.db_for_read(Task) == "default"
+        assert router.db_for_write(Task) == "default"
+        # read-after-write stays on the primary
+        assert router.db_for_read(Task) == "default"
+    assert router.db_for_read(Task) == "default"
+
+
+def test_router_without_replicas(settings):
+    settings.DATABASE_REPLICAS = []
+    with use_replica():
+        assert ReplicaRouter().db_for_read(Task) == "default"
+    assert ReplicaRouter().allow_migrate("default", "core") is None
+
+
+def test_replicas_are_not_migrated(replicas):
+    assert ReplicaRouter().allow_migrate("replica", "core") is False
+
+
+def bearer_client(user):
+    # no cookie jar: Bearer-token clients must be pinned through the user, not a cookie
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def replica_reads(client, path):
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        r = client.get(path)
+    assert r.status_code == 200
+    return len(replica_queries)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_safe_requests_read_from_replica_until_user_writes(replicas):
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    other = User.objects.create_superuser("admin2", "admin2@example.com", "adminpass")
+    cat = Category.objects.create(name="Cat1")
+    client = bearer_client(admin)
+    assert replica_reads(client, "/api/categories/") > 0
+
+    # a rejected write doesn't pin
+    r = client.post("/api/products/", {"name": "P1", "category": cat.pk}, format="json")
+    assert r.status_code == 400
+    assert replica_reads(client, "/api/categories/") > 0
+
+    r = client.post("/api/products/", {"name": "P1", "category": cat.pk, "price": "9.99", "stock": 1}, format="json")
+    assert r.status_code == 201
+    assert not r.cookies
+
+    # pinned: the user's next reads go to the primary, even from a fresh client; other users aren't affected
+    assert replica_reads(bearer_client(admin), "/api/products/") == 0
+    assert replica_reads(bearer_client(other), "/api/products/") > 0
+    assert Product.objects.filter(name="P1", price=Decimal("9.99")).exists()
@@ -0,0 +1,70 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from core import jobs
+from core.models import Category, Product
+from core.tasks import restore_category_tree
+
+User = get_user_model()
+
+
+@pytest.fixture
+def deleted_tree():
+    root = Category.objects.create(name="root")
+    children = [Category.objects.create(name=f"c{i}", parent=root) for i in range(2)]
+    grandchild = Category.objects.create(name="g", parent=children[0])
+    for cat in [root, *children, grandchild]:
+        Product.objects.create(name=f"p-{cat.name}", category=cat, price=Decimal("1.00"))
+    other = Category.objects.create(name="other")
+    root.soft_delete_tree()
+    other.soft_delete()
+    return root, other
+
+
+@pytest.mark.django_db
+def test_restore_tree_job(settings, deleted_tree):
+    settings.JOB_CHUNK_SIZE = 2
+    root, other = deleted_tree
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    r = client.post(f"/api/categories/{root.pk}/restore-tree/")
+    assert r.status_code == 202
+    job_id = r.data["job_id"]
+
+    assert Category.objects.filter(is_deleted=True).get() == other
+    assert not Product.objects.filter(is_deleted=True).exists()
+    assert set(Product.objects.values_list("updated_by", flat=True)) == {admin.pk}
+    r = client.get(f"/api/jobs/{job_id}/")
+    assert r.status_code == 200
+    assert r.data == {"id": job_id, "state": "SUCCESS", "done": 8, "total": 8}
+
+
+@pytest.mark.django_db
+def test_cancelled_job_stops_between_chunks(deleted_tree):
+    root, _ = deleted_tree
+    job_id = str(uuid.uuid4())
+    cache.set(jobs.CANCEL_KEY.format(job_id), True)
+    restore_category_tree.apply(args=[root.pk], task_id=job_id)
+    assert jobs.job_status(job_id) == {"id": job_id, "state": "CANCELLED", "done": 0, "total": 8}
+    assert not Category.objects.filter(is_deleted=False).exists()
+
+
+@pytest.mark.django_db
+def test_job_endpoints_are_admin_only():
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    client = APIClient()
+    client.force_authenticate(user)
+    job_id = str(uuid.uuid4())
+    assert client.post(f"/api/jobs/{job_id}/cancel/").status_code == 403
+
+    client.force_authenticate(admin)
+    assert client.post(f"/api/jobs/{job_id}/cancel/").status_code == 202
+    assert jobs.is_cancelled(job_id)
+    assert client.get(f"/api/jobs/{job_id}/").data["state"] == "PENDING"
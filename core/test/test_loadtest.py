@@ -0,0 +1,29 @@
+import pytest
+from django.db import connection
+
+from core.loadtest import MIX, percentile, run_load, seed, summarize
+
+
+def test_percentiles():
+    values = sorted(i / 1000 for i in range(1, 101))
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 50) is None
+    summary = summarize([0.002, 0.001], errors=1)
+    assert summary["error_rate"] == 0.5
+    assert summary["latency_ms"]["p50"] == 1.0
+    assert summary["latency_ms"]["max"] == 2.0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_short_run_against_live_server(live_server):
+    # SQLite's in-memory test database locks whole tables without waiting, so no concurrent writers there
+    users = 1 if connection.vendor == "sqlite" else 2
+    accounts, product_ids = seed(users, products=10)
+    report = run_load(live_server.url, accounts, product_ids, users=users, duration=2, seed=7)
+    assert report["requests"] > 0
+    assert report["errors"] == 0, report["operations"]
+    assert report["throughput_rps"] > 0
+    assert set(report["operations"]) <= set(MIX)
+    assert report["operations"]["login"]["status_codes"]["200"] >= users
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
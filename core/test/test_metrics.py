@@ -0,0 +1,78 @@
+import socket
+from urllib.request import urlopen
+
+import pytest
+from celery import Celery
+from prometheus_client import CollectorRegistry, generate_latest
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from core.metrics import CeleryQueueCollector, REGISTRY
+from core.tasks import send_task_reminder, schedule_reminders
+from taskprod.celery import _serve_worker_metrics
+
+User = get_user_model()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture(autouse=True)
+def no_broker(settings):
+    settings.METRICS_CELERY_QUEUES = []
+
+
+@pytest.mark.django_db
+def test_viewset_actions_are_timed_and_query_counted():
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    client = APIClient()
+    client.force_authenticate(user)
+    labels = {"view": "TaskViewSet", "action": "list"}
+    before = sample("api_request_latency_seconds_count", status="200", **labels)
+
+    assert client.get("/api/tasks/").status_code == 200
+
+    assert sample("api_request_latency_seconds_count", status="200", **labels) == before + 1
+    assert sample("api_request_db_queries_sum", **labels) > 0
+    body = client.get("/metrics").content.decode()
+    assert 'api_request_latency_seconds_count{action="list",status="200",view="TaskViewSet"}' in body
+
+
+@pytest.mark.django_db
+def test_reminder_metrics():
+    before = sample("task_reminders_total", outcome="not_found")
+    batches = sample("reminder_schedule_batch_size_count")
+    send_task_reminder(987654)
+    schedule_reminders()
+    assert sample("task_reminders_total", outcome="not_found") == before + 1
+    assert sample("reminder_schedule_batch_size_count") == batches + 1
+
+
+def test_worker_serves_its_own_metrics(settings):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    settings.METRICS_WORKER_PORT = port
+    server, _ = _serve_worker_metrics()
+    try:
+        body = urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert "task_reminders_total" in body
+
+
+def test_queue_depth_collector():
+    app = Celery(broker="memory://")
+    with app.connection_for_write() as conn:
+        conn.SimpleQueue("reminders").put({"task_id": 1})
+        registry = CollectorRegistry()
+        registry.register(CeleryQueueCollector(app, ["reminders"]))
+        assert registry.get_sample_value("celery_queue_depth", {"queue": "reminders"}) == 1
+    assert b"celery_queue_depth" not in generate_latest(_missing_queue_registry())
+
+
+def _missing_queue_registry():
+    registry = CollectorRegistry()
+    registry.register(CeleryQueueCollector(Celery(broker="memory://"), ["missing"]))
+    return registry
@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.contrib.auth import get_user_model
+from core import partitions
+from core.models import Category, Product, Task
+from core.tasks import maintain_task_partitions
+
+User = get_user_model()
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != "postgresql", reason="range partitioning is Postgres-only"),
+]
+
+
+@pytest.fixture
+def make_task():
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    cat = Category.objects.create(name="Cat1")
+    product = Product.objects.create(name="P1", category=cat, price=Decimal("1.00"), stock=1)
+
+    def make(due, status=Task.STATUS_PENDING):
+        return Task.objects.create(product=product, assigned_user=user, title="T", status=status, due_date=due)
+    return make
+
+
+def partition_of(task):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tableoid::regclass::text FROM core_task WHERE id = %s", [task.pk])
+        return cursor.fetchone()[0]
+
+
+def test_range_queries_are_pruned(make_task):
+    months = [partitions.month_start(date.today(), i) for i in range(3)]
+    for month in months:
+        make_task(datetime.combine(month, datetime.min.time(), dt_timezone.utc).replace(day=15))
+    start = datetime.combine(months[1], datetime.min.time(), dt_timezone.utc)
+    end = datetime.combine(months[2], datetime.min.time(), dt_timezone.utc)
+
+    plan = Task.objects.filter(due_date__gte=start, due_date__lt=end).explain()
+    assert partitions.partition_name(months[1]) in plan
+    assert partitions.partition_name(months[0]) not in plan
+    assert partitions.partition_name(months[2]) not in plan
+    assert partitions.DEFAULT_PARTITION not in plan
+
+
+def test_create_partition_moves_rows_out_of_default(make_task):
+    task = make_task(datetime(2031, 5, 20, tzinfo=dt_timezone.utc))
+    assert partition_of(task) == partitions.DEFAULT_PARTITION
+    assert partitions.create_partition(date(2031, 5, 1)) is True
+    assert partitions.create_partition(date(2031, 5, 1)) is False
+    assert partition_of(task) == "core_task_p203105"
+    assert Task.objects.get(pk=task.pk).due_date == task.due_date
+
+
+def test_maintain_task_partitions_creates_months_ahead(settings):
+    settings.TASK_PARTITION_MONTHS_AHEAD = 6
+    maintain_task_partitions()
+    expected = {partitions.partition_name(partitions.month_start(date.today(), i)) for i in range(7)}
+    assert expected <= set(partitions.list_partitions())
+
+
+def test_detach_only_fully_completed_partitions(make_task):
+    partitions.create_partition(date(2020, 1, 1))
+    partitions.create_partition(date(2020, 2, 1))
+    make_task(datetime(2020, 1, 10, tzinfo=dt_timezone.utc), status=Task.STATUS_COMPLETED)
+    pending = make_task(datetime(2020, 2, 10, tzinfo=dt_timezone.utc))
+    with connection.cursor() as cursor:
+        # the rows above are still uncommitted; fire their deferred FK checks before DROP
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    assert partitions.detach_completed_partitions(date(2020, 3, 1), drop=True) == ["core_task_p202001"]
+    assert "core_task_p202001" not in partitions.list_partitions()
+    assert list(Task.objects.filter(due_date__year=2020)) == [pending]
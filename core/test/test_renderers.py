@@ -0,0 +1,85 @@
+import io
+import uuid
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from core import renderers
+from core.models import Category
+from core.parsers import ORJSONParser, MessagePackParser
+from core.renderers import ORJSONRenderer, MessagePackRenderer
+
+User = get_user_model()
+
+PAYLOAD = {
+    "price": Decimal("9.90"),
+    "created_at": datetime.datetime(2025, 8, 11, 18, 42, 1, 123456, tzinfo=datetime.timezone.utc),
+    "due_date": datetime.datetime(2025, 8, 11, 18, 42, tzinfo=datetime.timezone(datetime.timedelta(hours=5, minutes=30))),
+    "naive": datetime.datetime(2025, 8, 11, 18, 42),
+    "day": datetime.date(2025, 8, 11),
+    "duration": datetime.timedelta(minutes=90),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Pending"),
+    "text": "café     \"quoted\"",
+    "nested": [{"n": 1, "f": 0.5, "none": None, "flag": True}],
+    "floats": [1e16, -1.5e300, 1e-7, 1e-5, 0.0001, 0.0, 123456.789],
+    "big_decimal": Decimal("1E+20"),
+    1: "int key",
+}
+
+
+def test_orjson_renderer_is_byte_compatible():
+    assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_orjson_renderer_falls_back(monkeypatch):
+    big = {"n": 2 ** 70}
+    assert ORJSONRenderer().render(big) == JSONRenderer().render(big)
+    assert ORJSONRenderer().render(PAYLOAD, "application/json; indent=4") == \
+        JSONRenderer().render(PAYLOAD, "application/json; indent=4")
+    monkeypatch.setattr(renderers, "orjson", None)
+    assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf"), Decimal("NaN")])
+def test_orjson_renderer_rejects_non_finite_floats(value):
+    data = {"a": [None, {"b": value}]}
+    with pytest.raises(ValueError):
+        JSONRenderer().render(data)
+    with pytest.raises(ValueError):
+        ORJSONRenderer().render(data)
+
+
+def test_orjson_parser():
+    assert ORJSONParser().parse(io.BytesIO(b'{"a": [1, "x"]}')) == {"a": [1, "x"]}
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    payload = {k: v for k, v in PAYLOAD.items() if isinstance(k, str)}
+    data = MessagePackParser().parse(io.BytesIO(MessagePackRenderer().render(payload)))
+    assert data["price"] == 9.9
+    assert data["created_at"] == "2025-08-11T18:42:01.123456Z"
+    assert data["id"] == "12345678-1234-5678-1234-567812345678"
+    with pytest.raises(ParseError):
+        MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+@pytest.mark.django_db
+def test_msgpack_api():
+    pytest.importorskip("msgpack")
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    client = APIClient()
+    client.force_authenticate(admin)
+    body = MessagePackRenderer().render({"name": "Cat1", "description": "desc"})
+    r = client.post("/api/categories/", body, content_type="application/msgpack", HTTP_ACCEPT="application/msgpack")
+    assert r.status_code == 201
+    assert r["Content-Type"] == "application/msgpack"
+    assert MessagePackParser().parse(io.BytesIO(r.content))["id"] == Category.objects.get().pk
@@ -0,0 +1,47 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.models import Category, Product, Task
+from core.serializers import TaskSerializer, ProductSerializer, RowSerializer
+
+User = get_user_model()
+
+
+@pytest.fixture
+def data():
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    cat = Category.objects.create(name="Cat1")
+    product = Product.objects.create(name="P1", category=cat, price=Decimal("9.90"), stock=3)
+    due = timezone.now() + timedelta(days=1)
+    for i in range(3):
+        Task.objects.create(product=product, assigned_user=user, title=f"T{i}", due_date=due + timedelta(hours=i))
+    return user, product
+
+
+@pytest.mark.django_db
+def test_row_serializer_matches_model_serializer(data):
+    for serializer_class, qs in ((TaskSerializer, Task.objects.all()), (ProductSerializer, Product.objects.all())):
+        fields = list(serializer_class.Meta.fields)
+        expected = [dict(row) for row in serializer_class(qs, many=True).data]
+        assert RowSerializer(serializer_class, fields).render(qs.values(*fields)) == expected
+
+
+@pytest.mark.django_db
+def test_list_with_sparse_fields(data):
+    user, product = data
+    client = APIClient()
+    client.force_authenticate(user)
+
+    r = client.get("/api/tasks/", {"fields": "id,title,status", "ordering": "-due_date"})
+    assert r.status_code == 200
+    assert [row["title"] for row in r.json()] == ["T2", "T1", "T0"]
+    assert set(r.json()[0]) == {"id", "title", "status"}
+
+    r = client.get("/api/products/", {"fields": "id,price"})
+    assert r.json() == [{"id": product.pk, "price": "9.90"}]
+
+    r = client.get("/api/tasks/", {"fields": "id,nope"})
+    assert r.status_code == 400
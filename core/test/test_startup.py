@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.core.management import call_command
+from django.conf import settings
+from core.management.commands.bench_startup import ROLES, import_time_ms
+
+
+def test_import_time_ms_sums_top_level_imports():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       100 |        100 |   django.utils\n"
+              "import time:       200 |       1500 | django\n"
+              "import time:       300 |        500 | celery\n")
+    assert import_time_ms(stderr) == 2.0
+
+
+def test_lean_roles_boot():
+    out = StringIO()
+    call_command("bench_startup", roles="worker,command", runs=1, json=True, stdout=out)
+    results = json.loads(out.getvalue())
+    assert results["worker"]["settings"] == "taskprod.settings_worker"
+    assert results["command"]["import_ms"] > 0
+
+
+def test_worker_startup_skips_metrics():
+    # prometheus_client is only needed once a reminder task runs
+    settings_module, code = ROLES["worker"]
+    code += "; import sys; print('prometheus_client' in sys.modules)"
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    proc = subprocess.run([sys.executable, "-c", code], env=env, cwd=settings.BASE_DIR,
+                          capture_output=True, text=True, check=True)
+    assert proc.stdout.strip().splitlines()[-1] == "False"
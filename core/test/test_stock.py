@@ -0,0 +1,103 @@
+import threading
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from core.models import Category, Product, InsufficientStock
+
+User = get_user_model()
+
+
+def make_product(stock, name="P1"):
+    cat = Category.objects.create(name="Cat1")
+    return Product.objects.create(name=name, category=cat, price=Decimal("9.99"), stock=stock)
+
+
+@pytest.mark.django_db
+def test_reserve_and_release():
+    product = make_product(stock=5)
+    assert product.reserve(3) == 2
+    with pytest.raises(InsufficientStock):
+        product.reserve(3)
+    assert product.release(4) == 6
+    product.refresh_from_db()
+    assert product.stock == 6
+
+
+@pytest.mark.django_db
+def test_adjust_stock_is_all_or_nothing():
+    p1 = make_product(stock=5)
+    p2 = Product.objects.create(name="P2", category=p1.category, price=Decimal("1.00"), stock=1)
+    assert Product.adjust_stock({p1.pk: -2, p2.pk: 3}) == {p1.pk: 3, p2.pk: 4}
+    with pytest.raises(InsufficientStock):
+        Product.adjust_stock({p1.pk: 10, p2.pk: -5})
+    p1.refresh_from_db()
+    p2.refresh_from_db()
+    assert (p1.stock, p2.stock) == (3, 4)
+
+
+@pytest.mark.django_db
+def test_stock_endpoints():
+    admin = User.objects.create_superuser("admin", "admin@example.com", "adminpass")
+    user = User.objects.create_user("u1", "u1@example.com", "userpass")
+    product = make_product(stock=2)
+    client = APIClient()
+
+    client.force_authenticate(user)
+    r = client.post(f"/api/products/{product.pk}/reserve/", {"quantity": 2}, format="json")
+    assert r.status_code == 403
+    r = client.post(f"/api/products/{product.pk}/release/", {"quantity": 1_000_000}, format="json")
+    assert r.status_code == 403
+    r = client.post("/api/products/adjust-stock/", {"adjustments": [{"product": product.pk, "delta": 1}]}, format="json")
+    assert r.status_code == 403
+
+    client.force_authenticate(admin)
+    r = client.post(f"/api/products/{product.pk}/reserve/", {"quantity": 2}, format="json")
+    assert r.status_code == 200 and r.data["stock"] == 0
+    r = client.post(f"/api/products/{product.pk}/reserve/", {"quantity": 1}, format="json")
+    assert r.status_code == 409
+    r = client.post(f"/api/products/{product.pk}/release/", {"quantity": 0}, format="json")
+    assert r.status_code == 400
+    r = client.post(f"/api/products/{product.pk}/release/", {"quantity": 1}, format="json")
+    assert r.status_code == 200 and r.data["stock"] == 1
+    payload = {"adjustments": [{"product": product.pk, "delta": 4}, {"product": product.pk, "delta": -1}]}
+    r = client.post("/api/products/adjust-stock/", payload, format="json")
+    assert r.status_code == 200
+    assert r.data["stock"] == [{"id": product.pk, "stock": 4}]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_lose_no_updates():
+    if connection.vendor == "sqlite":
+        pytest.skip("needs a database with concurrent writers")
+    workers, attempts, initial = 8, 25, 150
+    product = make_product(stock=initial)
+    reserved = []
+    barrier = threading.Barrier(workers)
+
+    def worker():
+        ok = 0
+        barrier.wait()
+        try:
+            for _ in range(attempts):
+                try:
+                    Product(pk=product.pk).reserve(1)
+                    ok += 1
+                except InsufficientStock:
+                    pass
+        finally:
+            connection.close()
+        reserved.append(ok)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    product.refresh_from_db()
+    # 200 attempts against 150 units: exactly 150 succeed and stock ends at zero
+    assert sum(reserved) == initial
+    assert product.stock == 0
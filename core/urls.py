@@ -2,13 +2,14 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from .views import (CategoryViewSet, ProductViewSet, TaskViewSet,
+from .views import (CategoryViewSet, ProductViewSet, TaskViewSet, JobViewSet,
                     RegisterView, LogoutView, PasswordResetRequestView, PasswordResetConfirmView)
 
 router = DefaultRouter()
 router.register("categories", CategoryViewSet, basename="category")
 router.register("products", ProductViewSet, basename="product")
 router.register("tasks", TaskViewSet, basename="task")
+router.register("jobs", JobViewSet, basename="job")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -7,12 +7,19 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.core.cache import cache
+from django.conf import settings
+from django.utils.http import urlencode
 from django.core.mail import send_mail
 
-from .models import Category, Product, Task
+from .models import Category, Product, Task, InsufficientStock
 from .serializers import (CategorySerializer, ProductSerializer, TaskSerializer,
-                          UserSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer)
+                          UserSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer,
+                          StockQuantitySerializer, StockAdjustmentBatchSerializer, RowSerializer,
+                          AnalyticsQuerySerializer)
 from .permissions import IsAdminOrReadOnly, IsOwnerOrAdmin
+from .tasks import restore_category_tree
+from . import analytics, jobs
 
 User = get_user_model()
 
@@ -23,6 +30,40 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
+class SparseFieldsListMixin:
+    """
+    list?fields=id,title,status fetches only those columns with .values() and renders
+    them with RowSerializer; without ?fields the regular serializer is used.
+    """
+
+    def list(self, request, *args, **kwargs):
+        param = request.query_params.get("fields")
+        if not param:
+            return super().list(request, *args, **kwargs)
+        rows = RowSerializer.from_param(self.get_serializer_class(), param)
+        queryset = self.filter_queryset(self.get_queryset()).values(*rows.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.render(page))
+        return Response(rows.render(queryset.iterator(chunk_size=2000)))
+
+
+def cached_analytics(request, name, compute):
+    """
+    Validate the analytics query params and cache compute(params) for ANALYTICS_CACHE_TTL
+    seconds, per report, params and visibility (staff see all tasks, users their own).
+    """
+    params = AnalyticsQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    scope = "staff" if request.user.is_staff else f"user{request.user.pk}"
+    key = f"analytics:{name}:{scope}:{urlencode(sorted(request.query_params.items()))}"
+    data = cache.get(key)
+    if data is None:
+        data = compute(params)
+        cache.set(key, data, settings.ANALYTICS_CACHE_TTL)
+    return Response(data, status=status.HTTP_200_OK)
+
+
 class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.filter(is_deleted=False)
     serializer_class = CategorySerializer
@@ -38,20 +79,30 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save(updated_by=self.request.user)
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsAdminUser])
     def soft_delete(self, request, pk=None):
         obj = self.get_object()
-        obj.soft_delete()
-        return Response({"detail": "soft deleted"}, status=status.HTTP_200_OK)
+        # cascades to subcategories, their products and tasks (other users' included), so admin only
+        counts = obj.soft_delete_tree()
+        return Response({"detail": "soft deleted", **counts}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsAdminUser])
     def restore(self, request, pk=None):
-        obj = self.get_object()
-        obj.restore()
-        return Response({"detail": "restored"}, status=status.HTTP_200_OK)
+        # soft-deleted categories are hidden from get_queryset, so look the root up directly.
+        # Undoes soft_delete's cascade in one transaction; use restore-tree for very large trees.
+        obj = generics.get_object_or_404(Category.objects.all(), pk=pk)
+        counts = obj.restore_tree()
+        return Response({"detail": "restored", **counts}, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["post"], url_path="restore-tree", permission_classes=[IsAuthenticated, IsAdminUser])
+    def restore_tree(self, request, pk=None):
+        # same as restore, as a chunked background job
+        obj = generics.get_object_or_404(Category.objects.all(), pk=pk)
+        job = restore_category_tree.delay(obj.pk, request.user.pk)
+        return Response({"job_id": job.id}, status=status.HTTP_202_ACCEPTED)
 
-class ProductViewSet(viewsets.ModelViewSet):
+
+class ProductViewSet(SparseFieldsListMixin, viewsets.ModelViewSet):
     queryset = Product.objects.filter(is_deleted=False)
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
@@ -66,8 +117,50 @@ class ProductViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save(updated_by=self.request.user)
 
+    # Stock changes go through conditional F() updates instead of PUT-ing a new stock value,
+    # so concurrent order flows don't overwrite each other. Like PUT-ing stock they are admin
+    # operations (IsAdminOrReadOnly): reservations aren't tied to a record the user owns.
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsAdminUser])
+    def reserve(self, request, pk=None):
+        product = self.get_object()
+        serializer = StockQuantitySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            stock = product.reserve(serializer.validated_data["quantity"])
+        except InsufficientStock:
+            return Response({"detail": "insufficient stock"}, status=status.HTTP_409_CONFLICT)
+        return Response({"id": product.pk, "stock": stock}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsAdminUser])
+    def release(self, request, pk=None):
+        product = self.get_object()
+        serializer = StockQuantitySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        stock = product.release(serializer.validated_data["quantity"])
+        return Response({"id": product.pk, "stock": stock}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def analytics(self, request):
+        # task completion per product (?group=category: per category, including its subcategories)
+        return cached_analytics(request, "products", lambda params: analytics.task_breakdown(
+            params.filter(TaskViewSet.visible_tasks(request.user)), params.validated_data["group"],
+            within=params.validated_data.get("category")))
+
+    @action(detail=False, methods=["post"], url_path="adjust-stock",
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def adjust_stock(self, request):
+        serializer = StockAdjustmentBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            stock = Product.adjust_stock(serializer.get_deltas())
+        except InsufficientStock as exc:
+            return Response({"detail": "insufficient stock", "product": exc.product_id},
+                            status=status.HTTP_409_CONFLICT)
+        return Response({"stock": [{"id": pk, "stock": value} for pk, value in sorted(stock.items())]},
+                        status=status.HTTP_200_OK)
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+class TaskViewSet(SparseFieldsListMixin, viewsets.ModelViewSet):
     queryset = Task.objects.filter(is_deleted=False)
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
@@ -76,16 +169,25 @@ class TaskViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "description"]
     ordering_fields = ["due_date", "created_at"]
 
-    def get_queryset(self):
-        user = self.request.user
+    @staticmethod
+    def visible_tasks(user):
         if user.is_staff:
             return Task.objects.filter(is_deleted=False)
         return Task.objects.filter(assigned_user=user, is_deleted=False)
 
+    def get_queryset(self):
+        return self.visible_tasks(self.request.user)
+
     def perform_create(self, serializer):
         # allow anyone to create tasks (normal user must assign to themself or admin can assign others)
         serializer.save()
 
+    @action(detail=False, methods=["get"])
+    def analytics(self, request):
+        # overdue counts, completion rate and avg completion time per created_at bucket
+        return cached_analytics(request, "tasks", lambda params: analytics.task_series(
+            params.filter(self.get_queryset()), params.validated_data["bucket"]))
+
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def soft_delete(self, request, pk=None):
         task = self.get_object()
@@ -100,6 +202,21 @@ class TaskViewSet(viewsets.ModelViewSet):
         return Response({"detail": "restored"}, status=status.HTTP_200_OK)
 
 
+class JobViewSet(viewsets.ViewSet):
+    """
+    Poll (GET /jobs/<id>/) or cancel (POST /jobs/<id>/cancel/) a background job.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def retrieve(self, request, pk=None):
+        return Response(jobs.job_status(pk), status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        jobs.cancel_job(pk)
+        return Response({"detail": "cancellation requested"}, status=status.HTTP_202_ACCEPTED)
+
+
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
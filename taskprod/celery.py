@@ -1,8 +1,21 @@
 import os
 from celery import Celery
+from celery.signals import worker_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "taskprod.settings")
 
 app = Celery("taskprod")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+@worker_init.connect
+def _serve_worker_metrics(**kwargs):
+    # workers have no /metrics view; they serve their own on a separate port
+    from django.conf import settings
+
+    port = getattr(settings, "METRICS_WORKER_PORT", None)
+    if port:
+        from core.metrics import start_worker_server
+
+        return start_worker_server(port)
@@ -0,0 +1,128 @@
+"""
+Primary/replica routing.
+
+Reads go to one of settings.DATABASE_REPLICAS only when it is safe to do so:
+  - inside a safe-method (GET/HEAD/OPTIONS) request that hasn't written anything,
+  - inside a `use_replica()` block (read-only Celery tasks, reports).
+Everything else, including any read that follows a write in the same request/task,
+stays on the primary. After a write the middleware pins the authenticated user to the
+primary for settings.REPLICA_PIN_SECONDS (a cache entry, so Bearer-token clients that
+keep no cookies are covered) until replicas have caught up.
+"""
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+PRIMARY = "default"
+PIN_KEY = "replica_pin:{}"
+
+_state = threading.local()
+
+
+def _replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def _use_replica():
+    return getattr(_state, "replica", False) and not getattr(_state, "wrote", False)
+
+
+@contextmanager
+def use_replica():
+    """Route reads inside the block to a replica (until the first write)."""
+    previous = (getattr(_state, "replica", False), getattr(_state, "wrote", False))
+    _state.replica, _state.wrote = True, False
+    try:
+        yield
+    finally:
+        _state.replica, _state.wrote = previous
+
+
+@contextmanager
+def use_primary():
+    """Force reads inside the block to the primary."""
+    previous = getattr(_state, "replica", False)
+    _state.replica = False
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = _replicas()
+        if replicas and _use_replica():
+            return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        # read-after-write: from here on this request/task reads from the primary
+        _state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {PRIMARY, *_replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas are copies of the primary and never migrated directly
+        if db in _replicas():
+            return False
+        return None
+
+
+def _user_id(request):
+    """The requesting user's id: a valid Bearer token's user claim, else the session user."""
+    # imported here: the router is loaded by lean Celery processes that have no DRF
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+    from rest_framework_simplejwt.settings import api_settings
+
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw = auth.get_raw_token(header) if header else None
+    if raw is not None:
+        try:
+            return auth.get_validated_token(raw).get(api_settings.USER_ID_CLAIM)
+        except InvalidToken:
+            return None
+    user = getattr(request, "user", None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Enables replica reads for safe-method requests, unless the user wrote
+    something within the last settings.REPLICA_PIN_SECONDS.
+    Must come after AuthenticationMiddleware (session users).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in ("GET", "HEAD", "OPTIONS")
+        replica = safe and bool(_replicas())
+        if replica:
+            user_id = _user_id(request)
+            replica = user_id is None or cache.get(PIN_KEY.format(user_id)) is None
+        previous = (getattr(_state, "replica", False), getattr(_state, "wrote", False))
+        _state.replica, _state.wrote = replica, False
+        try:
+            response = self.get_response(request)
+            wrote = _state.wrote
+        finally:
+            _state.replica, _state.wrote = previous
+
+        if wrote and _replicas():
+            # DRF has set request.user to the token's user by now
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                cache.set(PIN_KEY.format(user.pk), True, getattr(settings, "REPLICA_PIN_SECONDS", 15))
+        return response
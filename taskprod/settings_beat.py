@@ -0,0 +1,4 @@
+from .settings_worker import *  # noqa: F401,F403
+
+# Celery beat additionally needs the database scheduler's models.
+INSTALLED_APPS = INSTALLED_APPS + ["django_celery_beat"]
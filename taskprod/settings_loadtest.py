@@ -0,0 +1,18 @@
+from .test_settings import *  # noqa: F401,F403
+
+# Load-test profile (manage.py loadtest): the test stack with every external service
+# replaced by an in-process stand-in. Postgres by default, SQLite with TEST_SQLITE=1;
+# the loadtest command creates and destroys its own test database either way.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "loadtest"}}
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+# one process, so the locmem cache is as shared as django-ratelimit needs it to be
+SILENCED_SYSTEM_CHECKS = ["django_ratelimit.E003", "django_ratelimit.W001"]
+
+# a file (not in-memory) database so the server threads and the virtual users share it
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = {"timeout": 30}
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "loadtest_db.sqlite3"}
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+
+# throttling would turn a sustained run into 429s
+REST_FRAMEWORK = {**REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": ()}
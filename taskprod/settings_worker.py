@@ -0,0 +1,14 @@
+from .settings import *  # noqa: F401,F403
+
+# Lean profile for Celery workers and data-only management commands (create_admin, bench_*):
+# only the apps whose models the tasks touch, no admin/swagger/DRF/middleware.
+# Use taskprod.settings for migrate and anything that serves HTTP.
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django_celery_results",
+    "core",
+]
+
+MIDDLEWARE = []
+ROOT_URLCONF = "taskprod.urls_worker"
@@ -0,0 +1,14 @@
+from .settings import *  # noqa: F401,F403
+
+# Test settings: same stack as settings.py, plus a "replica" alias mirroring the
+# test database so routing can be exercised without a second server.
+# TEST_SQLITE=1 swaps Postgres for SQLite when no database server is available.
+if env.bool("TEST_SQLITE", default=False):
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "test_db.sqlite3"}}
+
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+
+# run Celery tasks in-process, keeping their results/progress in the result backend
+CELERY_BROKER_URL = "memory://"
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_STORE_EAGER_RESULT = True
@@ -4,6 +4,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from core.metrics import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(title="TaskProd API", default_version="v1", description="Task & Product Management API"),
     public=True,
@@ -13,6 +15,7 @@ schema_view = get_schema_view(
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("core.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("swagger(.json|.yaml)", schema_view.without_ui(cache_timeout=0), name="schema-json"),
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
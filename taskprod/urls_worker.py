@@ -0,0 +1,3 @@
+# Workers never serve HTTP; an empty urlconf keeps startup system checks from importing
+# the API views, swagger and admin.
+urlpatterns = []